@@ -1,9 +1,13 @@
-import os
-
 from PySide6.QtCore import QObject, QThread, Signal
 
 from .model import SearchWorker
-from .utilities import SearchRecord, sanitize_extensions
+from .store import ResultStore
+from .utilities import (
+    DEFAULT_CONTEXT_LINES,
+    DEFAULT_MEMORY_BUDGET_MB,
+    ScanRoot,
+    sanitize_extensions,
+)
 
 # ----------------------------
 # Controller
@@ -12,8 +16,9 @@ from .utilities import SearchRecord, sanitize_extensions
 
 class SearchController(QObject):
     scanningChanged = Signal(bool)  # noqa: N815
-    resultsReady = Signal(list)  # noqa: N815
+    resultsReady = Signal(object)  # noqa: N815  (ResultStore)
     progressChanged = Signal(int)  # noqa: N815
+    rootProgressChanged = Signal(str, int)  # noqa: N815
     errorOccurred = Signal(str)  # noqa: N815
 
     def __init__(self) -> None:
@@ -21,19 +26,28 @@ class SearchController(QObject):
         self._thread: QThread | None = None
         self.worker: SearchWorker | None = None
 
-    def validate_inputs(self, folder: str, needle: str) -> str | None:
-        if not folder:
+    def validate_inputs(
+        self, roots: list[ScanRoot], needle: str
+    ) -> str | None:
+        # Only checks that need no filesystem access: a dead network mount
+        # would hang the GUI here. Directories are checked by the worker.
+        if not roots:
             return "Please choose a folder."
-        if not os.path.isdir(folder):
-            return "The selected path is not a directory."
         if not needle:
             return "Please enter the text to search for."
         return None
 
     def start_scan(
-        self, folder: str, needle: str, ext_text: str, include_names: bool
+        self,
+        roots: list[ScanRoot],
+        needle: str,
+        ext_text: str,
+        include_names: bool,
+        context_before: int = DEFAULT_CONTEXT_LINES,
+        context_after: int = DEFAULT_CONTEXT_LINES,
+        memory_budget_mb: int = DEFAULT_MEMORY_BUDGET_MB,
     ) -> None:
-        err = self.validate_inputs(folder, needle)
+        err = self.validate_inputs(roots, needle)
         if err:
             self.errorOccurred.emit(err)
             return
@@ -42,11 +56,20 @@ class SearchController(QObject):
         self.stop_scan()  # in case something is running
 
         self._thread = QThread()
-        self.worker = SearchWorker(folder, needle, extensions, include_names)
+        self.worker = SearchWorker(
+            roots,
+            needle,
+            extensions,
+            include_names,
+            context_before=max(0, context_before),
+            context_after=max(0, context_after),
+            memory_budget=max(1, memory_budget_mb) * 1024 * 1024,
+        )
         self.worker.moveToThread(self._thread)
 
         self._thread.started.connect(self.worker.run)
         self.worker.progress.connect(self.progressChanged)
+        self.worker.rootProgress.connect(self.rootProgressChanged)
         self.worker.error.connect(self._on_worker_error)
         self.worker.finished.connect(self._on_worker_finished)
 
@@ -59,7 +82,7 @@ class SearchController(QObject):
         self.scanningChanged.emit(False)
         self.stop_scan()
 
-    def _on_worker_finished(self, results: list[SearchRecord]) -> None:
+    def _on_worker_finished(self, results: ResultStore) -> None:
         self.resultsReady.emit(results)
         self.scanningChanged.emit(False)
         self.stop_scan()
@@ -1,5 +1,10 @@
 import os
-from collections.abc import Callable
+import re
+import threading
+from collections import OrderedDict, deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import batched
 from typing import Any
 
 from PySide6.QtCore import (
@@ -8,11 +13,23 @@ from PySide6.QtCore import (
     QObject,
     QPersistentModelIndex,
     Qt,
+    QThread,
     Signal,
     Slot,
 )
 
-from .utilities import SearchRecord, truncate_line
+from .store import ResultStore
+from .utilities import (
+    MAX_CAPTURED_LINE_LENGTH,
+    RESULTS_CACHED_PAGES,
+    RESULTS_PAGE_SIZE,
+    SINK_BATCH_SIZE,
+    ScanRoot,
+    SearchRecord,
+    group_roots_by_device,
+    resolve_roots,
+    truncate_line,
+)
 
 # ----------------------------
 # Model (search logic)
@@ -23,81 +40,291 @@ class SearchModel:
     def __init__(self) -> None:
         pass
 
-    def search_in_file(
-        self, filepath: str, needle: str
-    ) -> list[tuple[int, int, str]]:
-        """Return list of tuples (count_in_line, line_number, line_text)."""
-        results = []
+    def iter_file_matches(
+        self,
+        filepath: str,
+        needle: str,
+        context_before: int = 0,
+        context_after: int = 0,
+    ) -> Iterator[SearchRecord]:
+        """
+        Yield one SearchRecord per matching line, with the match column,
+        the full line and up to `context_before`/`context_after` surrounding
+        lines captured in the same pass (no second read of the file).
+        Records are yielded in line order as soon as their context is
+        complete, so a file with many hits is never held in memory.
+        """
         search_lower = needle.lower()
+        # Used for the column only: offsets into line.lower() can drift
+        # from the original line when lowercasing changes its length.
+        search_re = re.compile(re.escape(needle), re.IGNORECASE)
+        # Ring buffer of the last `context_before` lines
+        before: deque[str] = deque(maxlen=context_before)
+        # Records still waiting for their trailing context lines; each one
+        # leaves the list after `context_after` lines, so it stays bounded.
+        pending: list[tuple[SearchRecord, list[str]]] = []
         try:
             with open(filepath, encoding="utf-8", errors="ignore") as f:
                 for i, line in enumerate(f, start=1):
+                    # Only built when a hit or a context buffer needs it,
+                    # so lines without hits cost no more than a lookup.
+                    text: str | None = None
+                    if pending:
+                        text = truncate_line(line, MAX_CAPTURED_LINE_LENGTH)
+                        done = self._feed_pending(pending, text, context_after)
+                        if done is not None:
+                            yield done
                     ll = line.lower()
                     if search_lower in ll:
-                        count = ll.count(search_lower)
-                        results.append((count, i, truncate_line(line)))
+                        if text is None:
+                            text = truncate_line(
+                                line, MAX_CAPTURED_LINE_LENGTH
+                            )
+                        m = search_re.search(line)
+                        rec = SearchRecord(
+                            occurrences=ll.count(search_lower),
+                            file=filepath,
+                            line_number=i,
+                            line_text=truncate_line(line),
+                            column=m.start() if m else None,
+                            full_line=text,
+                            context_before=tuple(before),
+                        )
+                        if context_after:
+                            pending.append((rec, []))
+                        else:
+                            yield rec
+                    if context_before:
+                        before.append(
+                            text
+                            if text is not None
+                            else truncate_line(line, MAX_CAPTURED_LINE_LENGTH)
+                        )
         except Exception as e:
             # Ignore unreadable files
             print(f"Warning: could not read file {filepath}: {e}")
-        return results
+        # End of file: flush whatever trailing context was collected
+        for rec, after in pending:
+            rec.context_after = tuple(after)
+            yield rec
 
-    def recursive_search(
+    def _feed_pending(
         self,
-        folder: str,
+        pending: list[tuple[SearchRecord, list[str]]],
+        text: str,
+        context_after: int,
+    ) -> SearchRecord | None:
+        """Add a line to every waiting record, return the one now complete."""
+        for _, after in pending:
+            after.append(text)
+        if len(pending[0][1]) < context_after:
+            return None
+        rec, after = pending.pop(0)
+        rec.context_after = tuple(after)
+        return rec
+
+    def name_match_record(
+        self, full_path: str, fname: str, needle_lower: str
+    ) -> SearchRecord:
+        return SearchRecord(
+            occurrences=fname.lower().count(needle_lower),
+            file=full_path,
+            line_number=None,
+            line_text=f"[MATCH IN FILE NAME] {fname}",
+        )
+
+    def multi_root_search(
+        self,
+        roots: list[ScanRoot],
         text: str,
         extensions: list[str],
         include_name_matches: bool,
-        progress_cb: Callable[[int], None] | None = None,
+        context_before: int = 0,
+        context_after: int = 0,
+        progress_cb: Callable[[str, int], None] | None = None,
         stop_flag: Callable[[], bool] = lambda: False,
-    ) -> list[SearchRecord]:
-        records: list[SearchRecord] = []
-        needle_lower = text.lower()
-
-        total_files = 0
-        for _, _, files in os.walk(folder):
-            total_files += len(files)
-        processed = 0
-
-        for root, _, files in os.walk(folder):
-            if stop_flag():
-                break
-            for fname in files:
-                if stop_flag():
-                    break
-                full_path = os.path.join(root, fname)
-                fl = fname.lower()
-
-                # 1) filename match
-                if include_name_matches and needle_lower in fl:
-                    records.append(
-                        SearchRecord(
-                            occurrences=fl.count(needle_lower),
-                            file=full_path,
-                            line_number=None,
-                            line_text=f"[MATCH IN FILE NAME] {fname}",
-                        )
+        store: ResultStore | None = None,
+    ) -> ResultStore:
+        """
+        Scan several roots in parallel and merge their results into `store`
+        (a new in-memory ResultStore when not given).
+
+        Each root is walked by its own thread and read by a pool of
+        `root.io_limit` workers. Roots on the same device also share a
+        semaphore, so a slow mount listed twice is not hit twice as hard,
+        while roots on other devices keep going at their own pace.
+        progress_cb receives (root path, percentage) for every root.
+        """
+        records = store if store is not None else ResultStore()
+        errors: list[BaseException] = []
+
+        def sink(batch: list[SearchRecord]) -> None:
+            if batch:
+                records.extend(batch)
+
+        def scan_root(root: ScanRoot, device_sem: threading.Semaphore) -> None:
+            try:
+                _RootScan(
+                    self,
+                    root,
+                    device_sem,
+                    text,
+                    extensions,
+                    include_name_matches,
+                    context_before,
+                    context_after,
+                    sink,
+                    progress_cb,
+                    stop_flag,
+                    errors,
+                ).run()
+            except BaseException as e:
+                errors.append(e)
+
+        threads = []
+        for group in group_roots_by_device(roots).values():
+            device_sem = threading.BoundedSemaphore(
+                max(max(r.io_limit, 1) for r in group)
+            )
+            for root in group:
+                threads.append(
+                    threading.Thread(
+                        target=scan_root,
+                        args=(root, device_sem),
+                        name=f"scan-root:{root.path}",
+                        daemon=True,
                     )
+                )
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        if errors:
+            raise errors[0]
+        return records
 
-                # 2) extension and contents
-                if any(fl.endswith(ext) for ext in extensions):
-                    for count, line_num, line_text in self.search_in_file(
-                        full_path, text
-                    ):
-                        records.append(
-                            SearchRecord(
-                                occurrences=count,
-                                file=full_path,
-                                line_number=line_num,
-                                line_text=line_text,
-                            )
-                        )
 
-                processed += 1
-                if progress_cb and total_files:
-                    pct = int((processed / total_files) * 100)
-                    progress_cb(pct)
+class _RootScan:
+    """One root being scanned by SearchModel.multi_root_search."""
 
-        return records
+    def __init__(
+        self,
+        model: SearchModel,
+        root: ScanRoot,
+        device_sem: threading.Semaphore,
+        text: str,
+        extensions: list[str],
+        include_name_matches: bool,
+        context_before: int,
+        context_after: int,
+        sink: Callable[[list[SearchRecord]], None],
+        progress_cb: Callable[[str, int], None] | None,
+        stop_flag: Callable[[], bool],
+        errors: list[BaseException],
+    ) -> None:
+        self.model = model
+        self.root = root
+        self.device_sem = device_sem
+        self.text = text
+        self.needle_lower = text.lower()
+        self.extensions = extensions
+        self.include_name_matches = include_name_matches
+        self.context_before = context_before
+        self.context_after = context_after
+        self.sink = sink
+        self.progress_cb = progress_cb
+        self.stop_flag = stop_flag
+        # Shared by every root of the scan; any error stops all of them
+        self.errors = errors
+        self.io_limit = max(root.io_limit, 1)
+
+        self.total_files = 0
+        self.processed = 0
+        self._last_pct = -1
+        self._progress_lock = threading.Lock()
+        # Bound the queued reads so a huge tree is not turned into millions
+        # of pending futures.
+        self._in_flight = threading.BoundedSemaphore(self.io_limit * 2)
+
+    def run(self) -> None:
+        for _, _, files in os.walk(self.root.path):
+            self.total_files += len(files)
+
+        with ThreadPoolExecutor(max_workers=self.io_limit) as pool:
+            for dirpath, _, files in os.walk(self.root.path):
+                if self._stopped():
+                    break
+                for fname in files:
+                    if self._stopped():
+                        break
+                    self._visit(pool, dirpath, fname)
+
+        if self.progress_cb:
+            self.progress_cb(self.root.path, 100)
+
+    def _visit(
+        self, pool: ThreadPoolExecutor, dirpath: str, fname: str
+    ) -> None:
+        full_path = os.path.join(dirpath, fname)
+        fl = fname.lower()
+
+        # 1) filename match
+        if self.include_name_matches and self.needle_lower in fl:
+            self.sink(
+                [
+                    self.model.name_match_record(
+                        full_path, fname, self.needle_lower
+                    )
+                ]
+            )
+
+        # 2) extension and contents, read on the worker pool
+        if any(fl.endswith(ext) for ext in self.extensions):
+            self._in_flight.acquire()
+            future = pool.submit(self._read_file, full_path)
+            future.add_done_callback(self._collect_error)
+        else:
+            self._advance()
+
+    def _read_file(self, full_path: str) -> None:
+        try:
+            if not self._stopped():
+                with self.device_sem:
+                    matches = self.model.iter_file_matches(
+                        full_path,
+                        self.text,
+                        self.context_before,
+                        self.context_after,
+                    )
+                    for batch in batched(matches, SINK_BATCH_SIZE):
+                        self.sink(list(batch))
+        finally:
+            self._in_flight.release()
+            self._advance()
+
+    def _stopped(self) -> bool:
+        return bool(self.errors) or self.stop_flag()
+
+    def _collect_error(self, future: Future[None]) -> None:
+        # Reader failures (store spill/flush, progress) must reach the
+        # caller instead of dying with the discarded future.
+        exc = future.exception()
+        if exc is not None:
+            self.errors.append(exc)
+
+    def _advance(self) -> None:
+        with self._progress_lock:
+            self.processed += 1
+            if not self.total_files:
+                # Files appeared after the counting walk
+                return
+            pct = min(100, int((self.processed / self.total_files) * 100))
+            if pct == self._last_pct:
+                return
+            self._last_pct = pct
+        if self.progress_cb:
+            self.progress_cb(self.root.path, pct)
 
 
 # ----------------------------
@@ -107,16 +334,38 @@ class SearchModel:
 
 class ResultsTableModel(QAbstractTableModel):
     HEADERS = ["Occurrences #", "File", "Line #", "Line text"]
+    sortingChanged = Signal(bool)  # noqa: N815
+    errorOccurred = Signal(str)  # noqa: N815
 
-    def __init__(self, data: list[SearchRecord] | None = None):
+    def __init__(self, data: ResultStore | None = None):
         super().__init__()
-        self._data: list[SearchRecord] = data or []
-
-    def setDataSet(self, data: list[SearchRecord]) -> None:  # noqa: N802
+        self._data: ResultStore = data if data is not None else ResultStore()
+        # Window cache over the store: page number -> rows, least recently
+        # used first. Keeps scrolling cheap when the results live on disk.
+        self._pages: OrderedDict[int, list[SearchRecord]] = OrderedDict()
+        self._sort_thread: QThread | None = None
+        self._sort_worker: SortWorker | None = None
+        # Stores replaced while a sort still holds them, closed afterwards
+        self._stale: list[ResultStore] = []
+
+    @property
+    def sorting(self) -> bool:
+        return self._sort_thread is not None
+
+    def setDataSet(self, data: ResultStore) -> None:  # noqa: N802
         self.beginResetModel()
+        if data is not self._data:
+            if self.sorting:
+                self._stale.append(self._data)
+            else:
+                self._data.close()
         self._data = data
+        self._pages.clear()
         self.endResetModel()
 
+    def dataSet(self) -> ResultStore:  # noqa: N802
+        return self._data
+
     def rowCount(  # noqa: N802
         self, parent: QModelIndex | QPersistentModelIndex = QModelIndex()
     ) -> int:
@@ -134,7 +383,14 @@ class ResultsTableModel(QAbstractTableModel):
     ) -> Any:
         if not index.isValid():
             return None
-        rec = self._data[index.row()]
+        if self.sorting:
+            # The store is busy: show what is cached, never block on it
+            cached = self._cached_record(index.row())
+            if cached is None:
+                return None
+            rec = cached
+        else:
+            rec = self.record_at(index.row())
         col = index.column()
         if role == Qt.ItemDataRole.DisplayRole:
             if col == 0:
@@ -167,8 +423,75 @@ class ResultsTableModel(QAbstractTableModel):
             return Qt.ItemFlag.NoItemFlags
         return Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEnabled
 
+    def sort(
+        self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder
+    ) -> None:
+        # A reset rather than a layout change: remapping persistent indexes
+        # would need the whole old -> new row mapping, which for spilled
+        # results lives on disk. Selection and preview start over instead.
+        descending = order == Qt.SortOrder.DescendingOrder
+        if not self._data.spilled:
+            # Bounded by the memory budget, fast enough in place
+            self.beginResetModel()
+            self._data.sort(column, descending=descending)
+            self._pages.clear()
+            self.endResetModel()
+            return
+        if self.sorting:
+            return
+
+        # Spilled results are sorted by SQLite, which takes a while on
+        # millions of rows: run it in a worker, reset when it is done.
+        self._sort_thread = QThread()
+        self._sort_worker = SortWorker(self._data, column, descending)
+        self._sort_worker.moveToThread(self._sort_thread)
+        self._sort_thread.started.connect(self._sort_worker.run)
+        self._sort_worker.finished.connect(self._on_sort_finished)
+        self._sort_worker.error.connect(self._on_sort_error)
+        self._sort_thread.finished.connect(self._sort_thread.deleteLater)
+        self.sortingChanged.emit(True)
+        self._sort_thread.start()
+
+    def _on_sort_finished(self) -> None:
+        self._end_sort()
+        self.beginResetModel()
+        self._pages.clear()
+        self.endResetModel()
+
+    def _on_sort_error(self, msg: str) -> None:
+        self._end_sort()
+        self.errorOccurred.emit(msg)
+
+    def _end_sort(self) -> None:
+        if self._sort_thread:
+            self._sort_thread.quit()
+            self._sort_thread.wait()
+            self._sort_thread = None
+        self._sort_worker = None
+        for store in self._stale:
+            store.close()
+        self._stale = []
+        self.sortingChanged.emit(False)
+
+    def _cached_record(self, row: int) -> SearchRecord | None:
+        page_no, offset = divmod(row, RESULTS_PAGE_SIZE)
+        page = self._pages.get(page_no)
+        if page is None or offset >= len(page):
+            return None
+        return page[offset]
+
     def record_at(self, row: int) -> SearchRecord:
-        return self._data[row]
+        page_no, offset = divmod(row, RESULTS_PAGE_SIZE)
+        page = self._pages.get(page_no)
+        if page is None:
+            start = page_no * RESULTS_PAGE_SIZE
+            page = self._data.page(start, RESULTS_PAGE_SIZE)
+            self._pages[page_no] = page
+            if len(self._pages) > RESULTS_CACHED_PAGES:
+                self._pages.popitem(last=False)
+        else:
+            self._pages.move_to_end(page_no)
+        return page[offset]
 
 
 # ----------------------------
@@ -177,35 +500,56 @@ class ResultsTableModel(QAbstractTableModel):
 
 
 class SearchWorker(QObject):
-    progress = Signal(int)  # 0..100
-    finished = Signal(list)  # list[SearchRecord]
+    progress = Signal(int)  # 0..100, all roots together
+    rootProgress = Signal(str, int)  # noqa: N815  (root path, 0..100)
+    finished = Signal(object)  # ResultStore
     error = Signal(str)
 
     def __init__(
         self,
-        folder: str,
+        roots: list[ScanRoot],
         text: str,
         extensions: list[str],
         include_names: bool,
+        context_before: int = 0,
+        context_after: int = 0,
+        memory_budget: int | None = None,
     ):
         super().__init__()
-        self.folder = folder
+        self.roots = roots
         self.text = text
         self.extensions = extensions
         self.include_names = include_names
+        self.context_before = context_before
+        self.context_after = context_after
+        self.memory_budget = memory_budget
         self._stop = False
+        self._root_pct: dict[str, int] = {}
         self.model = SearchModel()
 
+    def _on_root_progress(self, path: str, pct: int) -> None:
+        # Called from the per-root scan threads
+        self._root_pct[path] = pct
+        self.rootProgress.emit(path, pct)
+        self.progress.emit(sum(self._root_pct.values()) // len(self._root_pct))
+
     @Slot()
     def run(self) -> None:
         try:
-            results = self.model.recursive_search(
-                self.folder,
+            # stat() and mount lookups can hang on a dead network share,
+            # so roots are resolved here rather than on the GUI thread.
+            self.roots = resolve_roots(self.roots)
+            self._root_pct = {r.path: 0 for r in self.roots}
+            results = self.model.multi_root_search(
+                self.roots,
                 self.text,
                 self.extensions,
                 self.include_names,
-                progress_cb=self.progress.emit,
+                context_before=self.context_before,
+                context_after=self.context_after,
+                progress_cb=self._on_root_progress,
                 stop_flag=lambda: self._stop,
+                store=ResultStore(self.memory_budget),
             )
             self.finished.emit(results)
         except Exception as e:
@@ -213,3 +557,22 @@ class SearchWorker(QObject):
 
     def stop(self) -> None:
         self._stop = True
+
+
+class SortWorker(QObject):
+    finished = Signal()
+    error = Signal(str)
+
+    def __init__(self, store: ResultStore, column: int, descending: bool):
+        super().__init__()
+        self.store = store
+        self.column = column
+        self.descending = descending
+
+    @Slot()
+    def run(self) -> None:
+        try:
+            self.store.sort(self.column, descending=self.descending)
+            self.finished.emit()
+        except Exception as e:
+            self.error.emit(str(e))
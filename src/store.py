@@ -0,0 +1,260 @@
+import csv
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import weakref
+from collections.abc import Callable, Iterator
+from operator import itemgetter
+from typing import Any
+
+from .utilities import SearchRecord
+
+# ----------------------------
+# Constants
+# ----------------------------
+
+
+# Rough per-record overhead on top of its strings (object, tuples, ints)
+RECORD_OVERHEAD = 200
+
+# Rows written to / read from the spill database at once
+SPILL_BATCH_SIZE = 5000
+
+# Table column -> (SQL column, in-memory sort key)
+SORT_COLUMNS: list[tuple[str, Callable[[SearchRecord], Any]]] = [
+    ("occurrences", lambda r: r.occurrences),
+    ("file", lambda r: r.file),
+    # NULL (file name match) sorts first in SQLite, mirror that in memory
+    ("line_number", lambda r: -1 if r.line_number is None else r.line_number),
+    ("line_text", lambda r: r.line_text),
+]
+
+EXPORT_HEADERS = ["Occurrences #", "File", "Line #", "Column", "Line text"]
+
+_COLUMNS = (
+    "occurrences, file, line_number, line_text, column_offset, full_line,"
+    " context_before, context_after"
+)
+
+
+# ----------------------------
+# Result store
+# ----------------------------
+
+
+class ResultStore:
+    """
+    Append-only collection of SearchRecords with a memory budget.
+
+    Records stay in a list until their estimated size exceeds
+    `memory_budget` bytes. Then everything moves to a temporary SQLite
+    file and later records are written there in batches, so a scan keeps a
+    flat footprint whatever the number of hits. Reads (`page`, `sort`,
+    `export_csv`) work the same way in both modes.
+    """
+
+    def __init__(self, memory_budget: int | None = None) -> None:
+        self.memory_budget = memory_budget  # bytes, None means unlimited
+        self.spill_path: str | None = None
+        self._lock = threading.RLock()
+        self._count = 0
+        # (insertion index, record); the index mirrors the SQLite row id
+        # so ties sort the same way in both modes.
+        self._memory: list[tuple[int, SearchRecord]] = []
+        self._memory_size = 0
+        self._conn: sqlite3.Connection | None = None
+        self._pending: list[tuple[Any, ...]] = []
+        self._sorted = False
+        self._finalizer: Callable[[], Any] | None = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def spilled(self) -> bool:
+        return self._conn is not None
+
+    def extend(self, records: list[SearchRecord]) -> None:
+        """Append records; safe to call from several scan threads."""
+        with self._lock:
+            first = self._count
+            self._count += len(records)
+            if self._conn is not None:
+                self._pending.extend(_to_row(r) for r in records)
+                if len(self._pending) >= SPILL_BATCH_SIZE:
+                    self._flush()
+                return
+            self._memory.extend(enumerate(records, start=first))
+            if self.memory_budget is not None:
+                self._memory_size += sum(map(_estimate_size, records))
+                if self._memory_size > self.memory_budget:
+                    self._spill()
+
+    def page(self, start: int, count: int) -> list[SearchRecord]:
+        """Return up to `count` records from row `start`, in current order."""
+        with self._lock:
+            if self._conn is None:
+                return [rec for _, rec in self._memory[start : start + count]]
+            self._flush()
+            if self._sorted:
+                query = (
+                    f"SELECT {_COLUMNS} FROM sorted_ids s"  # noqa: S608
+                    " JOIN records r ON r.id = s.id"
+                    " WHERE s.pos > ? ORDER BY s.pos LIMIT ?"
+                )
+            else:
+                query = (
+                    f"SELECT {_COLUMNS} FROM records"  # noqa: S608
+                    " WHERE id > ? ORDER BY id LIMIT ?"
+                )
+            rows = self._conn.execute(query, (start, count)).fetchall()
+            return [_from_row(row) for row in rows]
+
+    def sort(self, column: int, descending: bool = False) -> None:
+        """Reorder rows by a table column (see SORT_COLUMNS)."""
+        sql_column, key = SORT_COLUMNS[column]
+        with self._lock:
+            if self._conn is None:
+                # Same as ORDER BY <column> <direction>, id: back to insertion
+                # order first, then a stable sort on the column.
+                self._memory.sort(key=itemgetter(0))
+                self._memory.sort(
+                    key=lambda item: key(item[1]), reverse=descending
+                )
+                return
+            self._flush()
+            direction = "DESC" if descending else "ASC"
+            # Sorting happens inside SQLite (spilling to its own temp
+            # files), only the resulting order is kept as a table.
+            self._conn.execute("DROP TABLE IF EXISTS sorted_ids")
+            self._conn.execute(
+                "CREATE TABLE sorted_ids"
+                " (pos INTEGER PRIMARY KEY, id INTEGER NOT NULL)"
+            )
+            # sql_column and direction come from the fixed lists above
+            query = (
+                "INSERT INTO sorted_ids (id) SELECT id FROM records"  # noqa: S608
+                f" ORDER BY {sql_column} {direction}, id"
+            )
+            self._conn.execute(query)
+            self._conn.commit()
+            self._sorted = True
+
+    def iter_records(self) -> Iterator[SearchRecord]:
+        """Iterate every record in current order, one page at a time."""
+        for start in range(0, len(self), SPILL_BATCH_SIZE):
+            yield from self.page(start, SPILL_BATCH_SIZE)
+
+    def export_csv(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(EXPORT_HEADERS)
+            for rec in self.iter_records():
+                writer.writerow(
+                    [
+                        rec.occurrences,
+                        rec.file,
+                        "" if rec.line_number is None else rec.line_number,
+                        "" if rec.column is None else rec.column,
+                        rec.full_line or rec.line_text,
+                    ]
+                )
+
+    def close(self) -> None:
+        """Drop all records and delete the spill file, if any."""
+        with self._lock:
+            if self._finalizer is not None:
+                self._finalizer()
+            self._conn = None
+            self._pending = []
+            self._memory = []
+            self._memory_size = 0
+            self._count = 0
+            self._sorted = False
+
+    def _spill(self) -> None:
+        fd, path = tempfile.mkstemp(prefix="ffinder-", suffix=".db")
+        os.close(fd)
+        conn = sqlite3.connect(path, check_same_thread=False)
+        # Throwaway data: no journal, no fsync
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute(
+            "CREATE TABLE records ("
+            " id INTEGER PRIMARY KEY,"
+            " occurrences INTEGER, file TEXT, line_number INTEGER,"
+            " line_text TEXT, column_offset INTEGER, full_line TEXT,"
+            " context_before TEXT, context_after TEXT)"
+        )
+        self._conn = conn
+        self.spill_path = path
+        self._finalizer = weakref.finalize(self, _drop_spill, conn, path)
+
+        self._memory.sort(key=itemgetter(0))
+        self._conn.executemany(
+            f"INSERT INTO records ({_COLUMNS})"  # noqa: S608
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (_to_row(rec) for _, rec in self._memory),
+        )
+        self._conn.commit()
+        self._memory = []
+        self._memory_size = 0
+
+    def _flush(self) -> None:
+        if self._conn is None or not self._pending:
+            return
+        self._conn.executemany(
+            f"INSERT INTO records ({_COLUMNS})"  # noqa: S608
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            self._pending,
+        )
+        self._conn.commit()
+        self._pending = []
+
+
+def _estimate_size(rec: SearchRecord) -> int:
+    strings = (
+        rec.file,
+        rec.line_text,
+        rec.full_line,
+        *rec.context_before,
+        *rec.context_after,
+    )
+    return RECORD_OVERHEAD + sum(sys.getsizeof(s) for s in strings)
+
+
+def _to_row(rec: SearchRecord) -> tuple[Any, ...]:
+    return (
+        rec.occurrences,
+        rec.file,
+        rec.line_number,
+        rec.line_text,
+        rec.column,
+        rec.full_line,
+        json.dumps(rec.context_before),
+        json.dumps(rec.context_after),
+    )
+
+
+def _from_row(row: tuple[Any, ...]) -> SearchRecord:
+    return SearchRecord(
+        occurrences=row[0],
+        file=row[1],
+        line_number=row[2],
+        line_text=row[3],
+        column=row[4],
+        full_line=row[5],
+        context_before=tuple(json.loads(row[6])),
+        context_after=tuple(json.loads(row[7])),
+    )
+
+
+def _drop_spill(conn: sqlite3.Connection, path: str) -> None:
+    conn.close()
+    try:
+        os.remove(path)
+    except OSError as e:
+        print(f"Warning: could not remove spill file {path}: {e}")
@@ -25,6 +25,46 @@ DEFAULT_EXTENSIONS = [
     ".csv",
 ]
 
+# Context lines kept on each side of a match by default
+DEFAULT_CONTEXT_LINES = 2
+
+# Upper bound for captured (full/context) lines, so a minified file with a
+# single huge line cannot blow up memory.
+MAX_CAPTURED_LINE_LENGTH = 4096
+
+# Results kept in RAM before a scan spills them to a temporary database
+DEFAULT_MEMORY_BUDGET_MB = 256
+
+# Matches handed to the result store at once while a file is being read
+SINK_BATCH_SIZE = 500
+
+# Rows fetched per page (and pages kept) by the results table window cache
+RESULTS_PAGE_SIZE = 256
+RESULTS_CACHED_PAGES = 8
+
+# Multiple roots are separated by ";" and each root may carry its own I/O
+# concurrency limit as a "|N" suffix, e.g. "/data|8; /mnt/nfs|1".
+ROOT_SEPARATOR = ";"
+IO_LIMIT_SEPARATOR = "|"
+
+# Reader threads per root when no explicit limit is given
+DEFAULT_LOCAL_IO_LIMIT = 4
+DEFAULT_REMOTE_IO_LIMIT = 2
+
+# Filesystem types (as listed in /proc/mounts) treated as network mounts
+REMOTE_FS_TYPES = {
+    "nfs",
+    "nfs4",
+    "cifs",
+    "smbfs",
+    "smb3",
+    "afs",
+    "9p",
+    "fuse.sshfs",
+    "fuse.rclone",
+    "davfs",
+}
+
 
 # ----------------------------
 # Constants
@@ -45,12 +85,26 @@ def resource_path(relative_path: str) -> str:
 # ----------------------------
 
 
-@dataclass
+@dataclass(slots=True)
 class SearchRecord:
     occurrences: int
     file: str
     line_number: int | None  # None means "match in filename"
-    line_text: str
+    line_text: str  # truncated preview shown in the table
+    column: int | None = None  # 0-based offset of the first match in line
+    full_line: str = ""
+    # Context lines are tuples of the same str objects held by the scan ring
+    # buffer, so overlapping contexts of nearby hits are not duplicated.
+    context_before: tuple[str, ...] = ()
+    context_after: tuple[str, ...] = ()
+
+
+@dataclass
+class ScanRoot:
+    path: str
+    io_limit: int = 0  # 0 means "pick a default from the mount type"
+    device: int = 0  # st_dev, shared by roots living on the same device
+    remote: bool = False
 
 
 # ----------------------------
@@ -79,6 +133,109 @@ def sanitize_extensions(input_str: str) -> list[str]:
     return ext_list or DEFAULT_EXTENSIONS
 
 
+def parse_roots(input_str: str) -> list[ScanRoot]:
+    """
+    Parse the path field. Accepts ";"-separated folders, each optionally
+    followed by "|N" to cap the number of concurrent readers for that root.
+    Invalid limits are ignored (the default is used instead).
+    """
+    roots = []
+    for part in (input_str or "").split(ROOT_SEPARATOR):
+        part = part.strip()
+        if not part:
+            continue
+        path, sep, limit = part.rpartition(IO_LIMIT_SEPARATOR)
+        if sep and limit.strip().isdigit():
+            roots.append(ScanRoot(path.strip(), io_limit=int(limit)))
+        else:
+            roots.append(ScanRoot(part))
+    return roots
+
+
+def is_remote_mount(path: str) -> bool:
+    """
+    Best-effort detection of network mounts (NFS/SMB/...).
+    Windows: UNC paths and drives reported as DRIVE_REMOTE
+    Linux:   filesystem type of the closest mount point in /proc/mounts
+    Others:  not detected (treated as local)
+    """
+    path = os.path.abspath(path)
+    if sys.platform == "win32":
+        if path.startswith("\\\\"):
+            return True
+        try:
+            import ctypes
+
+            drive = os.path.splitdrive(path)[0] + "\\"
+            return bool(ctypes.windll.kernel32.GetDriveTypeW(drive) == 4)
+        except Exception:
+            return False
+    try:
+        with open("/proc/mounts", encoding="utf-8") as f:
+            mounts = [line.split()[1:3] for line in f]
+    except OSError:
+        return False
+    best, fstype = "", ""
+    for mount_point, mount_type in mounts:
+        mount_point = mount_point.replace("\\040", " ")
+        inside = path == mount_point or path.startswith(
+            mount_point.rstrip("/") + "/"
+        )
+        if inside and len(mount_point) > len(best):
+            best, fstype = mount_point, mount_type
+    return fstype in REMOTE_FS_TYPES
+
+
+def resolve_roots(roots: list[ScanRoot]) -> list[ScanRoot]:
+    """
+    Fill device/mount information and default I/O limits, dropping
+    duplicates and roots nested inside another root (they would be
+    scanned twice). Raises ValueError for a root that is not a directory.
+    Every step touches the filesystem: call it off the GUI thread.
+    """
+    for root in roots:
+        if not os.path.isdir(root.path):
+            raise ValueError(
+                f"The selected path is not a directory: {root.path}"
+            )
+    paths = {os.path.realpath(r.path): r for r in roots}
+    resolved = []
+    for real, root in paths.items():
+        if any(_is_nested(real, other) for other in paths):
+            continue
+        root.device = os.stat(real).st_dev
+        root.remote = is_remote_mount(real)
+        if root.io_limit <= 0:
+            root.io_limit = (
+                DEFAULT_REMOTE_IO_LIMIT
+                if root.remote
+                else DEFAULT_LOCAL_IO_LIMIT
+            )
+        resolved.append(root)
+    return resolved
+
+
+def _is_nested(path: str, parent: str) -> bool:
+    # commonpath raises ValueError for different drives or drive vs UNC
+    if path == parent:
+        return False
+    if os.path.splitdrive(path)[0] != os.path.splitdrive(parent)[0]:
+        return False
+    try:
+        return os.path.commonpath([parent, path]) == parent
+    except ValueError:
+        return False
+
+
+def group_roots_by_device(
+    roots: list[ScanRoot],
+) -> dict[int, list[ScanRoot]]:
+    groups: dict[int, list[ScanRoot]] = {}
+    for root in roots:
+        groups.setdefault(root.device, []).append(root)
+    return groups
+
+
 def truncate_line(s: str, limit: int = 90) -> str:
     s = s.rstrip("\n\r")
     if len(s) <= limit:
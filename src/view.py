@@ -1,6 +1,6 @@
 import os
 
-from PySide6.QtCore import QModelIndex, Slot
+from PySide6.QtCore import QModelIndex, Qt, Slot
 from PySide6.QtGui import QIcon, QTextCharFormat, QTextCursor
 from PySide6.QtWidgets import (
     QAbstractItemView,
@@ -17,6 +17,8 @@ from PySide6.QtWidgets import (
     QMessageBox,
     QPlainTextEdit,
     QPushButton,
+    QSpinBox,
+    QSplitter,
     QTableView,
     QVBoxLayout,
     QWidget,
@@ -24,7 +26,15 @@ from PySide6.QtWidgets import (
 
 from .controller import SearchController
 from .model import ResultsTableModel
-from .utilities import SearchRecord, open_in_file_manager_select
+from .store import ResultStore
+from .utilities import (
+    DEFAULT_CONTEXT_LINES,
+    DEFAULT_MEMORY_BUDGET_MB,
+    ROOT_SEPARATOR,
+    SearchRecord,
+    open_in_file_manager_select,
+    parse_roots,
+)
 
 # ----------------------------
 # View
@@ -40,12 +50,15 @@ class MainWindow(QMainWindow):
 
         # Controller + Model for table
         self.controller = SearchController()
-        self.table_model = ResultsTableModel([])
+        self.table_model = ResultsTableModel()
 
         # Bind controller signals
         self.controller.scanningChanged.connect(self.on_scanning_changed)
         self.controller.resultsReady.connect(self.on_results_ready)
         self.controller.progressChanged.connect(self.on_progress_changed)
+        self.controller.rootProgressChanged.connect(
+            self.on_root_progress_changed
+        )
         self.controller.errorOccurred.connect(self.on_error)
 
         # Build UI
@@ -61,6 +74,10 @@ class MainWindow(QMainWindow):
         inputs_layout = QGridLayout(inputs_group)
 
         self.path_edit = QLineEdit(self)
+        self.path_edit.setPlaceholderText(
+            "One or more folders separated by ';', optionally with a "
+            "reader limit, e.g. C:/logs; //server/share|1"
+        )
         self.path_btn = QPushButton("Browse…", self)
         self.search_edit = QLineEdit(self)
         self.search_edit.setPlaceholderText("Text to find…")
@@ -95,6 +112,23 @@ class MainWindow(QMainWindow):
             "Include matches from file names", self
         )
         self.include_names_check.setChecked(True)
+        self.context_before_spin = QSpinBox(self)
+        self.context_before_spin.setRange(0, 50)
+        self.context_before_spin.setValue(DEFAULT_CONTEXT_LINES)
+        self.context_before_spin.setPrefix("Before: ")
+        self.context_after_spin = QSpinBox(self)
+        self.context_after_spin.setRange(0, 50)
+        self.context_after_spin.setValue(DEFAULT_CONTEXT_LINES)
+        self.context_after_spin.setPrefix("After: ")
+        self.memory_spin = QSpinBox(self)
+        self.memory_spin.setRange(16, 65536)
+        self.memory_spin.setValue(DEFAULT_MEMORY_BUDGET_MB)
+        self.memory_spin.setSuffix(" MB")
+        self.memory_spin.setToolTip(
+            "Results above this size are moved to a temporary file on disk"
+        )
+        self.export_btn = QPushButton("Export CSV…", self)
+        self.export_btn.setEnabled(False)
 
         self.start_btn = QPushButton("Start Scan", self)
         self.status_label = QLabel("", self)
@@ -111,7 +145,15 @@ class MainWindow(QMainWindow):
         inputs_layout.addWidget(self.ext_combo, 2, 1)
         inputs_layout.addWidget(self.include_names_check, 2, 2)
 
-        inputs_layout.addWidget(self.status_label, 3, 0, 1, 3)
+        inputs_layout.addWidget(QLabel("Context lines:"), 3, 0)
+        inputs_layout.addWidget(self.context_before_spin, 3, 1)
+        inputs_layout.addWidget(self.context_after_spin, 3, 2)
+
+        inputs_layout.addWidget(QLabel("Memory budget:"), 4, 0)
+        inputs_layout.addWidget(self.memory_spin, 4, 1)
+        inputs_layout.addWidget(self.export_btn, 4, 2)
+
+        inputs_layout.addWidget(self.status_label, 5, 0, 1, 3)
 
         # Bottom results table
         self.table = QTableView(self)
@@ -136,17 +178,42 @@ class MainWindow(QMainWindow):
             3, QHeaderView.ResizeMode.Stretch
         )
         self.table.setSortingEnabled(True)
+        self.table.selectionModel().currentRowChanged.connect(
+            self.on_current_row_changed
+        )
+
+        # Preview pane (context captured during the scan, no file re-read)
+        self.preview = QPlainTextEdit(self)
+        self.preview.setReadOnly(True)
+        self.preview.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+        self.preview.setPlaceholderText("Select a result to preview it.")
+
+        # Rows are reordered or replaced on reset (sort, new results)
+        self.table_model.modelReset.connect(self.preview.clear)
+        self.table_model.sortingChanged.connect(self.on_sorting_changed)
+        self.table_model.errorOccurred.connect(self.on_error)
+
+        splitter = QSplitter(Qt.Orientation.Vertical, self)
+        splitter.addWidget(self.table)
+        splitter.addWidget(self.preview)
+        splitter.setStretchFactor(0, 3)
+        splitter.setStretchFactor(1, 1)
 
         root_layout.addWidget(inputs_group)
-        root_layout.addWidget(self.table)
+        root_layout.addWidget(splitter)
 
         # Actions
         self.path_btn.clicked.connect(self.choose_folder)
         self.start_btn.clicked.connect(self.on_start_clicked)
+        self.export_btn.clicked.connect(self.on_export_clicked)
 
         # Keep last search text for highlight
         self._last_needle: str = ""
 
+        # Scan progress, overall and per root
+        self._overall_progress = 0
+        self._root_progress: dict[str, int] = {}
+
     # ------- Slots / Handlers
 
     @Slot()
@@ -155,17 +222,30 @@ class MainWindow(QMainWindow):
             self, "Choose folder to scan"
         )
         if folder:
-            self.path_edit.setText(folder)
+            # Browsing adds another root instead of replacing the current ones
+            current = self.path_edit.text().strip().rstrip(ROOT_SEPARATOR)
+            self.path_edit.setText(
+                f"{current}{ROOT_SEPARATOR} {folder}" if current else folder
+            )
 
     @Slot()
     def on_start_clicked(self) -> None:
-        folder = self.path_edit.text().strip()
+        roots = parse_roots(self.path_edit.text())
         needle = self.search_edit.text().strip()
         ext_text = self.ext_combo.currentText().strip()
         include_names = self.include_names_check.isChecked()
 
         self._last_needle = needle
-        self.controller.start_scan(folder, needle, ext_text, include_names)
+        self._root_progress = {}
+        self.controller.start_scan(
+            roots,
+            needle,
+            ext_text,
+            include_names,
+            context_before=self.context_before_spin.value(),
+            context_after=self.context_after_spin.value(),
+            memory_budget_mb=self.memory_spin.value(),
+        )
 
     @Slot(bool)
     def on_scanning_changed(self, running: bool) -> None:
@@ -175,22 +255,114 @@ class MainWindow(QMainWindow):
         self.search_edit.setEnabled(not running)
         self.ext_combo.setEnabled(not running)
         self.include_names_check.setEnabled(not running)
+        self.context_before_spin.setEnabled(not running)
+        self.context_after_spin.setEnabled(not running)
+        self.memory_spin.setEnabled(not running)
+        self.export_btn.setEnabled(
+            not running and self.table_model.rowCount() > 0
+        )
+        self._overall_progress = 0
         self.status_label.setText("Scanning…" if running else "Ready.")
 
+    @Slot(bool)
+    def on_sorting_changed(self, busy: bool) -> None:
+        # Results on disk are sorted in the background; keep the table
+        # (and its header) inert until the new order is ready.
+        self.table.setEnabled(not busy)
+        self.export_btn.setEnabled(
+            not busy and self.table_model.rowCount() > 0
+        )
+        self.status_label.setText(
+            "Sorting results…" if busy else "Results sorted."
+        )
+
     @Slot(int)
     def on_progress_changed(self, pct: int) -> None:
-        self.status_label.setText(f"Scanning… {pct}%")
+        self._overall_progress = pct
+        self.update_progress_status()
+
+    @Slot(str, int)
+    def on_root_progress_changed(self, root: str, pct: int) -> None:
+        self._root_progress[root] = pct
+        self.update_progress_status()
+
+    def update_progress_status(self) -> None:
+        text = f"Scanning… {self._overall_progress}%"
+        if len(self._root_progress) > 1:
+            breakdown = "   ".join(
+                f"{root}: {pct}%" for root, pct in self._root_progress.items()
+            )
+            text += f"   —   {breakdown}"
+        self.status_label.setText(text)
 
-    @Slot(list)
-    def on_results_ready(self, results: list[SearchRecord]) -> None:
+    @Slot(object)
+    def on_results_ready(self, results: ResultStore) -> None:
         self.table_model.setDataSet(results)
-        self.status_label.setText(f"Found {len(results)} matches.")
+        msg = f"Found {len(results)} matches."
+        if results.spilled:
+            msg += " (over the memory budget, kept on disk)"
+        self.status_label.setText(msg)
+
+    @Slot()
+    def on_export_clicked(self) -> None:
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export results", "results.csv", "CSV files (*.csv)"
+        )
+        if not path:
+            return
+        try:
+            self.table_model.dataSet().export_csv(path)
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"Could not export: {e}")
+            return
+        self.status_label.setText(f"Exported results to {path}.")
 
     @Slot(str)
     def on_error(self, msg: str) -> None:
         QMessageBox.critical(self, "Error", msg)
         self.status_label.setText("Error.")
 
+    @Slot(QModelIndex, QModelIndex)
+    def on_current_row_changed(
+        self, current: QModelIndex, previous: QModelIndex
+    ) -> None:
+        if not current.isValid():
+            self.preview.clear()
+            return
+        self.show_preview(self.table_model.record_at(current.row()))
+
+    def show_preview(self, rec: SearchRecord) -> None:
+        if rec.line_number is None:
+            self.preview.setPlainText(rec.file)
+            return
+
+        first = rec.line_number - len(rec.context_before)
+        last = rec.line_number + len(rec.context_after)
+        width = len(str(last))
+        lines = [*rec.context_before, rec.full_line, *rec.context_after]
+        text_lines: list[str] = []
+        match_pos = 0
+        for offset, line in enumerate(lines):
+            num = first + offset
+            marker = ">" if num == rec.line_number else " "
+            prefix = f"{marker} {num:>{width}} | "
+            if num == rec.line_number:
+                match_pos = sum(len(t) + 1 for t in text_lines) + len(prefix)
+            text_lines.append(prefix + line)
+        self.preview.setPlainText("\n".join(text_lines))
+
+        # Select the first match on the hit line
+        end = (rec.column or 0) + len(self._last_needle)
+        if rec.column is not None and end <= len(rec.full_line):
+            cursor = QTextCursor(self.preview.document())
+            cursor.setPosition(match_pos + rec.column)
+            cursor.setPosition(
+                match_pos + end,
+                QTextCursor.MoveMode.KeepAnchor,
+            )
+            self.preview.setTextCursor(cursor)
+            self.preview.centerCursor()
+
     @Slot(QModelIndex)
     def on_table_double_clicked(self, index: QModelIndex) -> None:
         if not index.isValid():
@@ -0,0 +1,262 @@
+import os
+import threading
+import time
+
+import pytest
+from PySide6.QtCore import Qt
+
+from src.model import ResultsTableModel, SearchModel
+from src.store import ResultStore
+from src.utilities import ScanRoot, SearchRecord, resolve_roots
+
+
+def scan(tmp_path, content, needle, before, after):
+    path = tmp_path / "sample.log"
+    path.write_text(content, encoding="utf-8")
+    return list(
+        SearchModel().iter_file_matches(str(path), needle, before, after)
+    )
+
+
+def test_context_at_start_and_end_of_file(tmp_path):
+    content = "hit one\nb\nc\nd\nlast hit\n"
+    first, last = scan(tmp_path, content, "HIT", 2, 2)
+
+    assert first.line_number == 1
+    assert first.context_before == ()
+    assert first.context_after == ("b", "c")
+
+    assert last.line_number == 5
+    assert last.context_before == ("c", "d")
+    assert last.context_after == ()
+
+
+def test_overlapping_context(tmp_path):
+    content = "a\nhit\nhit\nz\n"
+    first, second = scan(tmp_path, content, "hit", 1, 1)
+    assert (first.context_before, first.context_after) == (("a",), ("hit",))
+    assert (second.context_before, second.context_after) == (
+        ("hit",),
+        ("z",),
+    )
+
+
+def test_column_is_offset_in_original_line(tmp_path):
+    # "İ".lower() is two characters long
+    (rec,) = scan(tmp_path, "İİ Foo\n", "foo", 0, 0)
+    assert rec.column == 3
+    assert rec.full_line[rec.column :] == "Foo"
+
+
+def test_context_without_trailing_lines(tmp_path):
+    content = "a\nb\nhit\nc\n"
+    (rec,) = scan(tmp_path, content, "hit", 1, 0)
+    assert rec.context_before == ("b",)
+    assert rec.context_after == ()
+    assert rec.full_line == "hit"
+
+
+def test_no_context_requested(tmp_path):
+    content = "hit\nb\nhit\n"
+    records = scan(tmp_path, content, "hit", 0, 0)
+    assert [r.line_number for r in records] == [1, 3]
+    assert all(r.context_before == r.context_after == () for r in records)
+
+
+# ----------------------------
+# multi_root_search
+# ----------------------------
+
+
+def make_tree(path, n_files, content="x\nerror here\n"):
+    path.mkdir()
+    for i in range(n_files):
+        (path / f"f{i}.log").write_text(content, encoding="utf-8")
+    return path
+
+
+class SlowReader(SearchModel):
+    """Counts concurrent reads, overall and per root."""
+
+    def __init__(self, delay=0.02):
+        super().__init__()
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+        self.active_per_root = {}
+        self.max_per_root = {}
+
+    def iter_file_matches(self, filepath, needle, before=0, after=0):
+        root = os.path.dirname(filepath)
+        with self.lock:
+            self.active += 1
+            self.active_per_root[root] = self.active_per_root.get(root, 0) + 1
+            self.max_active = max(self.max_active, self.active)
+            self.max_per_root[root] = max(
+                self.max_per_root.get(root, 0), self.active_per_root[root]
+            )
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+            self.active_per_root[root] -= 1
+        return iter(())
+
+
+def test_merges_roots_into_one_store(tmp_path):
+    a = make_tree(tmp_path / "a", 5)
+    b = make_tree(tmp_path / "b", 7)
+    (b / "error.bin").write_text("", encoding="utf-8")
+    progress = []
+
+    store = SearchModel().multi_root_search(
+        resolve_roots([ScanRoot(str(a)), ScanRoot(str(b))]),
+        "ERROR",
+        [".log"],
+        True,
+        progress_cb=lambda root, pct: progress.append((root, pct)),
+    )
+
+    records = list(store.iter_records())
+    assert len(records) == 5 + 7 + 1
+    assert {os.path.dirname(r.file) for r in records} == {str(a), str(b)}
+    last = {}
+    for root, pct in progress:
+        assert 0 <= pct <= 100
+        last[root] = pct
+    assert last == {str(a): 100, str(b): 100}
+
+
+def test_stop_flag_stops_scan(tmp_path):
+    a = make_tree(tmp_path / "a", 50)
+    reader = SlowReader(delay=0.01)
+    stop = threading.Event()
+    progress = []
+
+    def on_progress(root, pct):
+        progress.append(pct)
+        stop.set()
+
+    store = reader.multi_root_search(
+        [ScanRoot(str(a), io_limit=1)],
+        "error",
+        [".log"],
+        False,
+        progress_cb=on_progress,
+        stop_flag=stop.is_set,
+    )
+    assert len(store) == 0
+    # Stopped long before every file was read
+    assert reader.max_active <= 1
+    assert progress[-2] < 50
+
+
+def test_per_root_io_limit(tmp_path):
+    a = make_tree(tmp_path / "a", 12)
+    b = make_tree(tmp_path / "b", 12)
+    reader = SlowReader()
+    reader.multi_root_search(
+        [
+            ScanRoot(str(a), io_limit=1, device=1),
+            ScanRoot(str(b), io_limit=3, device=2),
+        ],
+        "error",
+        [".log"],
+        False,
+    )
+    assert reader.max_per_root[str(a)] == 1
+    assert 1 < reader.max_per_root[str(b)] <= 3
+
+
+def test_roots_on_same_device_share_limit(tmp_path):
+    a = make_tree(tmp_path / "a", 8)
+    b = make_tree(tmp_path / "b", 8)
+
+    shared = SlowReader()
+    shared.multi_root_search(
+        [
+            ScanRoot(str(a), io_limit=1, device=7),
+            ScanRoot(str(b), io_limit=1, device=7),
+        ],
+        "error",
+        [".log"],
+        False,
+    )
+    assert shared.max_active == 1
+
+    separate = SlowReader(delay=0.05)
+    separate.multi_root_search(
+        [
+            ScanRoot(str(a), io_limit=1, device=7),
+            ScanRoot(str(b), io_limit=1, device=8),
+        ],
+        "error",
+        [".log"],
+        False,
+    )
+    assert separate.max_active == 2
+
+
+def test_store_errors_are_raised(tmp_path):
+    a = make_tree(tmp_path / "a", 3)
+
+    class FullDisk(ResultStore):
+        def extend(self, records):
+            raise OSError("disk full")
+
+    with pytest.raises(OSError, match="disk full"):
+        SearchModel().multi_root_search(
+            [ScanRoot(str(a))], "error", [".log"], False, store=FullDisk()
+        )
+
+
+# ----------------------------
+# ResultsTableModel
+# ----------------------------
+
+
+def make_store(n, memory_budget=None):
+    store = ResultStore(memory_budget)
+    store.extend(
+        [
+            SearchRecord(
+                occurrences=i % 4,
+                file=f"/logs/f{i % 3}.log",
+                line_number=i + 1,
+                line_text=f"error {i}",
+            )
+            for i in range(n)
+        ]
+    )
+    return store
+
+
+def test_sort_in_memory_is_immediate(qtbot):
+    model = ResultsTableModel(make_store(50))
+    with qtbot.assertNotEmitted(model.sortingChanged):
+        model.sort(2, Qt.SortOrder.DescendingOrder)
+    assert model.record_at(0).line_number == 50
+
+
+def test_sort_spilled_runs_in_background(qtbot):
+    store = make_store(3000, memory_budget=1)
+    assert store.spilled
+    model = ResultsTableModel(store)
+    first = model.record_at(0)
+
+    with qtbot.waitSignal(model.sortingChanged) as busy:
+        model.sort(2, Qt.SortOrder.DescendingOrder)
+    assert busy.args == [True]
+    assert model.sorting
+    # Only cached rows are served while the store is busy
+    assert model.data(model.index(0, 1)) == first.file
+    assert model.data(model.index(2999, 1)) is None
+
+    with qtbot.waitSignals(
+        [model.modelReset, model.sortingChanged], timeout=10000
+    ):
+        pass
+    assert not model.sorting
+    assert model.record_at(0).line_number == 3000
+    assert model.record_at(2999).line_number == 1
+    model.setDataSet(ResultStore())
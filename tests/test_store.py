@@ -0,0 +1,115 @@
+import os
+
+import pytest
+
+from src.store import ResultStore
+from src.utilities import SearchRecord
+
+
+def make_records(n: int, start: int = 0) -> list[SearchRecord]:
+    return [
+        SearchRecord(
+            occurrences=(i % 3) + 1,
+            file=f"/logs/file{i % 5}.log",
+            line_number=i + 1,
+            line_text=f"error {i}",
+            column=0,
+            full_line=f"error {i}",
+            context_before=(f"before {i}",),
+            context_after=(f"after {i}",),
+        )
+        for i in range(start, start + n)
+    ]
+
+
+@pytest.fixture
+def spilled_store():
+    # A tiny budget makes the first batch cross it
+    store = ResultStore(memory_budget=1)
+    yield store
+    store.close()
+
+
+def test_stays_in_memory_under_budget():
+    store = ResultStore(memory_budget=10 * 1024 * 1024)
+    store.extend(make_records(100))
+    assert not store.spilled
+    assert store.spill_path is None
+    assert len(store) == 100
+
+
+def test_spills_when_budget_is_crossed():
+    store = ResultStore(memory_budget=5000)
+    store.extend(make_records(5))
+    assert not store.spilled
+    store.extend(make_records(50, start=5))
+    assert store.spilled
+    assert os.path.exists(store.spill_path)
+    assert len(store) == 55
+    store.close()
+
+
+def test_page_before_and_after_spill():
+    records = make_records(200)
+    store = ResultStore(memory_budget=20000)
+    store.extend(records[:10])
+    assert store.page(3, 4) == records[3:7]
+
+    for i in range(10, 200, 10):
+        store.extend(records[i : i + 10])
+    assert store.spilled
+    # Rows written before the spill, across it, and after it
+    assert store.page(0, 5) == records[:5]
+    assert store.page(8, 5) == records[8:13]
+    assert store.page(190, 20) == records[190:]
+    assert store.page(200, 5) == []
+    assert list(store.iter_records()) == records
+    store.close()
+
+
+@pytest.mark.parametrize("column", [0, 1, 2, 3])
+@pytest.mark.parametrize("descending", [False, True])
+def test_sort_order_matches_in_memory_and_on_disk(
+    spilled_store, column, descending
+):
+    records = make_records(60)
+    records.append(
+        SearchRecord(
+            occurrences=2,
+            file="/logs/x",
+            line_number=None,
+            line_text="[MATCH IN FILE NAME] x",
+        )
+    )
+    memory_store = ResultStore()
+    memory_store.extend(records)
+    spilled_store.extend(records)
+    assert spilled_store.spilled
+
+    # Ties must come out the same regardless of the previous sort
+    for store in (memory_store, spilled_store):
+        store.sort(2, descending=True)
+        store.sort(column, descending=descending)
+
+    assert list(memory_store.iter_records()) == list(
+        spilled_store.iter_records()
+    )
+
+
+def test_export_csv(spilled_store, tmp_path):
+    spilled_store.extend(make_records(3))
+    out = tmp_path / "out.csv"
+    spilled_store.export_csv(str(out))
+    lines = out.read_text(encoding="utf-8").splitlines()
+    assert lines[0] == "Occurrences #,File,Line #,Column,Line text"
+    assert lines[1] == "1,/logs/file0.log,1,0,error 0"
+    assert len(lines) == 4
+
+
+def test_close_deletes_spill_file(spilled_store):
+    spilled_store.extend(make_records(10))
+    path = spilled_store.spill_path
+    assert path and os.path.exists(path)
+    spilled_store.close()
+    assert not os.path.exists(path)
+    assert len(spilled_store) == 0
@@ -0,0 +1,46 @@
+import os
+
+import pytest
+
+from src.utilities import (
+    DEFAULT_LOCAL_IO_LIMIT,
+    ScanRoot,
+    parse_roots,
+    resolve_roots,
+)
+
+
+def test_parse_roots_io_limits():
+    roots = parse_roots(" /data|8 ; /mnt/nfs|1;;/plain ")
+    assert [(r.path, r.io_limit) for r in roots] == [
+        ("/data", 8),
+        ("/mnt/nfs", 1),
+        ("/plain", 0),
+    ]
+
+
+def test_parse_roots_ignores_invalid_limit():
+    assert parse_roots("/odd|name") == [ScanRoot("/odd|name")]
+    assert parse_roots("") == []
+
+
+def test_resolve_roots_drops_nested_and_duplicates(tmp_path):
+    outer = tmp_path / "outer"
+    inner = outer / "inner"
+    other = tmp_path / "other"
+    inner.mkdir(parents=True)
+    other.mkdir()
+
+    roots = resolve_roots(
+        parse_roots(f"{outer}; {inner}; {other}|3; {other}|3")
+    )
+    assert [r.path for r in roots] == [str(outer), str(other)]
+    assert roots[0].io_limit == DEFAULT_LOCAL_IO_LIMIT
+    assert roots[1].io_limit == 3
+    assert roots[0].device == os.stat(outer).st_dev
+
+
+def test_resolve_roots_rejects_non_directory(tmp_path):
+    missing = tmp_path / "missing"
+    with pytest.raises(ValueError, match="not a directory"):
+        resolve_roots([ScanRoot(str(missing))])